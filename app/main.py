@@ -7,21 +7,26 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import streamlit as st
+from langchain_core.runnables import RunnableLambda
 
 from src.chatbot_oficina.rag.loader import load_documents, split_documents
 from src.chatbot_oficina.rag.vectorstore import create_embeddings, create_vectorstore, load_vectorstore
 from src.chatbot_oficina.chat.model import get_llm
 from src.chatbot_oficina.rag.chain import create_rag_chain
-from src.chatbot_oficina.guards.topic_validator import validate_topic
-from src.chatbot_oficina.guards.injection_detector import detect_injection
+from src.chatbot_oficina.chat.pipeline import processar_mensagem
 from src.chatbot_oficina.database.repository import (
-    identificar_ou_criar_cliente, salvar_conversa, buscar_cliente_por_telefone
+    identificar_ou_criar_cliente, buscar_cliente_por_telefone, listar_conversas_anteriores
 )
 
 
 DATA_PATH = "data/documentos"
 CHROMA_PATH = "data/chroma_db"
 
+# Mensagens exibidas por vez; as anteriores ficam recolhidas
+JANELA_MENSAGENS = 20
+# Máximo de mensagens mantidas na memória da sessão
+MAX_MENSAGENS_SESSAO = 200
+
 
 @st.cache_resource
 def initialize_rag():
@@ -42,6 +47,55 @@ def initialize_rag():
     return rag_chain
 
 
+def adicionar_mensagens(*mensagens, no_inicio: bool = False):
+    """Adiciona mensagens ao histórico, descartando as mais antigas acima do limite."""
+    if no_inicio:
+        espaco = MAX_MENSAGENS_SESSAO - len(st.session_state.messages)
+        if espaco > 0:
+            st.session_state.messages[:0] = list(mensagens)[-espaco:]
+        return
+
+    st.session_state.messages.extend(mensagens)
+    excesso = len(st.session_state.messages) - MAX_MENSAGENS_SESSAO
+    if excesso > 0:
+        del st.session_state.messages[:excesso]
+        # Descartadas continuam no Supabase e podem ser recarregadas
+        st.session_state.historico_esgotado = False
+
+
+def registrar_conversa(prompt: str, resposta: str, conversa_id=None):
+    """Adiciona a troca ao histórico da sessão."""
+    adicionar_mensagens(
+        {"role": "user", "content": prompt, "conversa_id": conversa_id},
+        {"role": "assistant", "content": resposta, "conversa_id": conversa_id},
+    )
+
+
+def carregar_historico():
+    """Carrega do Supabase as conversas anteriores à mais antiga em memória."""
+    ids = [m["conversa_id"] for m in st.session_state.messages if m.get("conversa_id")]
+    conversas = listar_conversas_anteriores(
+        st.session_state.cliente_id,
+        antes_id=min(ids) if ids else None,
+        limite=JANELA_MENSAGENS // 2
+    )
+    if len(conversas) < JANELA_MENSAGENS // 2:
+        st.session_state.historico_esgotado = True
+
+    mensagens = []
+    for conversa in reversed(conversas):
+        mensagens.append({"role": "user", "content": conversa["mensagem"], "conversa_id": conversa["id"]})
+        mensagens.append({"role": "assistant", "content": conversa["resposta"], "conversa_id": conversa["id"]})
+    adicionar_mensagens(*mensagens, no_inicio=True)
+
+
+def reiniciar_historico():
+    """Limpa o histórico exibido da sessão."""
+    st.session_state.messages = []
+    st.session_state.janela = JANELA_MENSAGENS
+    st.session_state.historico_esgotado = False
+
+
 st.set_page_config(
     page_title="Chatbot - AutoCare Oficina",
     page_icon="🚗",
@@ -55,7 +109,7 @@ st.markdown("Bem-vindo! Sou o assistente virtual da AutoCare. Como posso ajudar
 
 # Inicializar sessão
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    reiniciar_historico()
 
 if "cliente_id" not in st.session_state:
     st.session_state.cliente_id = None
@@ -142,83 +196,62 @@ with st.sidebar:
             st.session_state.cliente_id = None
             st.session_state.cliente_nome = None
             st.session_state.cliente_telefone = None
-            st.session_state.messages = []
+            reiniciar_historico()
             st.rerun()
 
 # ============================================
 # ÁREA PRINCIPAL - Chat
 # ============================================
 
-# Mostrar mensagens anteriores
-for message in st.session_state.messages:
+# Mensagens fora da janela ficam recolhidas até o cliente pedir
+ocultas = len(st.session_state.messages) - st.session_state.janela
+pode_carregar = (
+    st.session_state.get("cliente_id")
+    and st.session_state.cliente_id > 0
+    and not st.session_state.historico_esgotado
+    and len(st.session_state.messages) < MAX_MENSAGENS_SESSAO
+)
+
+if ocultas > 0:
+    if st.button(f"Mostrar mensagens anteriores ({ocultas} ocultas)", key="btn_mais_mensagens"):
+        st.session_state.janela += JANELA_MENSAGENS
+        st.rerun()
+elif pode_carregar:
+    if st.button("Carregar histórico de conversas", key="btn_historico"):
+        try:
+            antes = len(st.session_state.messages)
+            carregar_historico()
+            st.session_state.janela += len(st.session_state.messages) - antes
+        except Exception as e:
+            st.error(f"Erro ao carregar histórico: {str(e)}")
+        st.rerun()
+
+for message in st.session_state.messages[-st.session_state.janela:]:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
 # Input do chat
 if prompt := st.chat_input("Digite sua mensagem..."):
-    # Verificar prompt injection primeiro
-    is_injection, msg_injection = detect_injection(prompt)
-    if is_injection:
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        with st.chat_message("user"):
-            st.markdown(prompt)
-        st.session_state.messages.append({"role": "assistant", "content": msg_injection})
-        with st.chat_message("assistant"):
-            st.markdown(msg_injection)
-        
-        # Salvar no banco se cliente logado
-        if st.session_state.get("cliente_id") and st.session_state.cliente_id > 0:
-            try:
-                salvar_conversa(st.session_state.cliente_id, prompt, msg_injection)
-            except:
-                pass
-        
-        st.rerun()
-    
-    # Verificar se o tema é válido
-    is_valid, msg_topic = validate_topic(prompt)
-    if not is_valid:
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        with st.chat_message("user"):
-            st.markdown(prompt)
-        st.session_state.messages.append({"role": "assistant", "content": msg_topic})
-        with st.chat_message("assistant"):
-            st.markdown(msg_topic)
-        
-        # Salvar no banco se cliente logado
-        if st.session_state.get("cliente_id") and st.session_state.cliente_id > 0:
-            try:
-                salvar_conversa(st.session_state.cliente_id, prompt, msg_topic)
-            except:
-                pass
-        
-        st.rerun()
-    
-    # Processar mensagem normalmente
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    
+    # Nova mensagem recolhe de novo o histórico expandido
+    st.session_state.janela = JANELA_MENSAGENS
     with st.chat_message("user"):
         st.markdown(prompt)
     
     with st.chat_message("assistant"):
         with st.spinner("Pensando..."):
             try:
-                rag_chain = initialize_rag()
-                response = rag_chain.invoke(prompt)
-                st.markdown(response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-                
-                # Salvar no banco de dados se cliente logado
-                if st.session_state.get("cliente_id") and st.session_state.cliente_id > 0:
-                    try:
-                        salvar_conversa(st.session_state.cliente_id, prompt, response)
-                    except Exception as e:
-                        st.warning(f"Erro ao salvar conversa: {e}")
-                        
+                # Guards, RAG e persistência (ver chat.pipeline); o RAG só é
+                # inicializado quando a mensagem passa pelos guards
+                rag_chain = RunnableLambda(lambda texto: initialize_rag().invoke(texto))
+                resultado = processar_mensagem(prompt, rag_chain, st.session_state.cliente_id)
+                st.markdown(resultado.resposta)
+                if resultado.erro_persistencia:
+                    st.warning(f"Erro ao salvar conversa: {resultado.erro_persistencia}")
+                registrar_conversa(prompt, resultado.resposta, resultado.conversa_id)
             except Exception as e:
                 error_msg = f"Desculpe, ocorreu um erro ao processar sua pergunta: {str(e)}"
                 st.markdown(error_msg)
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                registrar_conversa(prompt, error_msg)
 
 # ============================================
 # SIDEBAR - Informações Adicionais
@@ -236,7 +269,7 @@ with st.sidebar:
     """)
     
     if st.button("Limpar Conversa"):
-        st.session_state.messages = []
+        reiniciar_historico()
         st.rerun()
     
     st.markdown("---")
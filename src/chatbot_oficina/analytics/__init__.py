@@ -0,0 +1 @@
+"""Módulo de exportação e análise de conversas."""
@@ -0,0 +1,128 @@
+"""Exporta e analisa as conversas pela linha de comando.
+
+Exemplos:
+    python -m src.chatbot_oficina.analytics exportar --destino data/export
+    python -m src.chatbot_oficina.analytics analisar --origem data/export --grupos 20
+    python -m src.chatbot_oficina.analytics varrer --origem data/export --destino data/export_redigido
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.chatbot_oficina.analytics.analysis import gerar_relatorio, varrer_mensagens
+from src.chatbot_oficina.analytics.export import carregar_conversas, exportar_conversas
+
+
+def _exportar(args):
+    def progresso(checkpoint):
+        print(
+            f"Parte {checkpoint['partes']}: {checkpoint['linhas']} linhas "
+            f"(último id {checkpoint['ultimo_id']})",
+            file=sys.stderr,
+        )
+
+    checkpoint = exportar_conversas(
+        args.destino,
+        tamanho_pagina=args.pagina,
+        linhas_por_arquivo=args.linhas_por_arquivo,
+        pausa=args.pausa,
+        progresso=progresso,
+    )
+    print(f"Exportação concluída: {checkpoint['linhas']} linhas em {checkpoint['partes']} arquivos")
+
+
+def _analisar(args):
+    embeddings = None
+    if args.embeddings:
+        from src.chatbot_oficina.rag.vectorstore import create_embeddings
+        embeddings = create_embeddings()
+
+    tabela = carregar_conversas(args.origem, colunas=["mensagem", "resposta"])
+    relatorio = gerar_relatorio(tabela, n_grupos=args.grupos, embeddings=embeddings)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    guards = relatorio["guards"]
+    print(f"Conversas: {guards['total']}")
+    print(f"  Injection:    {guards['injection']:>8} ({100 * guards['taxa_injection']:.1f}%)")
+    print(f"  Fora do tema: {guards['fora_tema']:>8} ({100 * guards['taxa_fora_tema']:.1f}%)")
+    print(f"  Sem resposta: {guards['sem_resposta']:>8} ({100 * guards['taxa_sem_resposta']:.1f}%)")
+
+    print("\nPerguntas mais frequentes:")
+    for item in relatorio["perguntas_frequentes"]:
+        print(f"  {item['contagem']:>6}  {item['pergunta']}")
+
+    print("\nTermos frequentes em perguntas fora do tema (candidatos a ALLOWED_TOPICS):")
+    for item in relatorio["termos_fora_do_tema"]:
+        print(f"  {item['contagem']:>6}  {item['termo']}")
+
+    print("\nGrupos de perguntas (sem resposta alta = lacuna no FAQ):")
+    for grupo in relatorio["grupos"]:
+        termos = ", ".join(grupo["termos"]) if grupo["grupo"] >= 0 else "sem grupo"
+        print(
+            f"  {grupo['tamanho']:>6}  sem resposta {100 * grupo['taxa_sem_resposta']:5.1f}%  "
+            f"fora do tema {100 * grupo['taxa_fora_tema']:5.1f}%  "
+            f"[{termos}]  ex.: {grupo['exemplo']}"
+        )
+
+
+def _varrer(args):
+    destino = Path(args.destino)
+    destino.mkdir(parents=True, exist_ok=True)
+
+    total = injection = fora_tema = com_pii = 0
+    for arquivo in sorted(Path(args.origem).glob("conversas-*.parquet")):
+        tabela = varrer_mensagens(pq.read_table(arquivo))
+        pq.write_table(tabela, destino / arquivo.name, compression="zstd")
+
+        total += tabela.num_rows
+        injection += pc.sum(tabela["guard_injection"]).as_py() or 0
+        fora_tema += pc.sum(tabela["guard_fora_tema"]).as_py() or 0
+        com_pii += pc.sum(pc.greater(pc.list_value_length(tabela["pii"]), 0)).as_py() or 0
+        print(f"{arquivo.name}: {tabela.num_rows} linhas", file=sys.stderr)
+
+    print(f"Mensagens: {total}")
+    print(f"  Bloqueadas por injection: {injection}")
+    print(f"  Bloqueadas por tema:      {fora_tema}")
+    print(f"  Com dados pessoais:       {com_pii}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exportação e análise de conversas")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    exportar = subparsers.add_parser("exportar", help="Exporta conversas para Parquet")
+    exportar.add_argument("--destino", default="data/export")
+    exportar.add_argument("--pagina", type=int, default=1000, help="Linhas por consulta")
+    exportar.add_argument("--linhas-por-arquivo", type=int, default=100_000)
+    exportar.add_argument("--pausa", type=float, default=0.1,
+                          help="Espera entre consultas, em segundos")
+    exportar.set_defaults(func=_exportar)
+
+    analisar = subparsers.add_parser("analisar", help="Analisa conversas exportadas")
+    analisar.add_argument("--origem", default="data/export")
+    analisar.add_argument("--grupos", type=int, default=20)
+    analisar.add_argument("--embeddings", action="store_true",
+                          help="Agrupa com embeddings em vez de TF-IDF")
+    analisar.add_argument("--json", help="Salva o relatório neste arquivo")
+    analisar.set_defaults(func=_analisar)
+
+    varrer = subparsers.add_parser(
+        "varrer", help="Reaplica guards e redação de dados pessoais ao histórico exportado"
+    )
+    varrer.add_argument("--origem", default="data/export")
+    varrer.add_argument("--destino", default="data/export_redigido")
+    varrer.set_defaults(func=_varrer)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
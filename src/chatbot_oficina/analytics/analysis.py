@@ -0,0 +1,392 @@
+"""Análises vetorizadas sobre as conversas exportadas."""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.chatbot_oficina.guards.injection_detector import INJECTION_MESSAGE
+from src.chatbot_oficina.guards.preprocess import preprocessar_lote
+from src.chatbot_oficina.guards.topic_validator import ALLOWED_TOPICS, REDIRECT_MESSAGE
+
+
+# Respostas em que o modelo admite não ter a informação (ver SYSTEM_PROMPT)
+SEM_RESPOSTA_PATTERN = (
+    r"n[ãa]o (tenho|possuo|temos|encontrei)[^.]{0,30}informa[çc]|"
+    r"entr(e|ar) em contato diretamente"
+)
+
+STOPWORDS = {
+    "a", "o", "as", "os", "um", "uma", "uns", "umas", "de", "da", "do", "das", "dos",
+    "em", "na", "no", "nas", "nos", "por", "para", "pra", "com", "sem", "que", "qual",
+    "quais", "quanto", "quanta", "como", "onde", "quando", "e", "ou", "se", "meu",
+    "minha", "meus", "minhas", "seu", "sua", "vocês", "voces", "você", "voce", "eu",
+    "é", "tem", "têm", "ter", "fazer", "faz", "fazem", "ao", "à", "está",
+    "esta", "isso", "esse", "essa", "mais", "muito", "já", "ja", "não", "nao", "sim",
+    "oi", "olá", "ola", "bom", "dia", "boa", "tarde", "noite", "obrigado", "obrigada",
+}
+
+
+def normalizar_texto(coluna) -> pa.Array:
+    """Minúsculas, sem pontuação e com espaços colapsados."""
+    texto = pc.utf8_lower(coluna)
+    texto = pc.replace_substring_regex(texto, r"[^\p{L}\p{N}\s]", " ")
+    texto = pc.replace_substring_regex(texto, r"\s+", " ")
+    return pc.utf8_trim_whitespace(texto)
+
+
+def classificar_respostas(tabela: pa.Table) -> pa.Table:
+    """
+    Adiciona as colunas booleanas injection, fora_tema e sem_resposta.
+
+    Args:
+        tabela: Tabela com as colunas mensagem e resposta
+
+    Returns:
+        Tabela com as colunas de classificação
+    """
+    resposta = tabela["resposta"]
+    injection = pc.fill_null(pc.equal(resposta, INJECTION_MESSAGE), False)
+    fora_tema = pc.fill_null(pc.equal(resposta, REDIRECT_MESSAGE), False)
+    sem_resposta = pc.fill_null(
+        pc.match_substring_regex(pc.utf8_lower(resposta), SEM_RESPOSTA_PATTERN), False
+    )
+    sem_resposta = pc.and_(sem_resposta, pc.invert(pc.or_(injection, fora_tema)))
+
+    return (
+        tabela
+        .append_column("injection", injection)
+        .append_column("fora_tema", fora_tema)
+        .append_column("sem_resposta", sem_resposta)
+    )
+
+
+def varrer_mensagens(tabela: pa.Table, tamanho_lote: int = 50_000) -> pa.Table:
+    """
+    Reaplica o pré-processamento atual (guards e PII) às mensagens históricas.
+
+    Útil para medir o efeito de novas regras sobre o histórico e para
+    redigir dados pessoais de conversas gravadas antes da redação existir.
+
+    Args:
+        tabela: Tabela com a coluna mensagem
+        tamanho_lote: Linhas processadas por lote
+
+    Returns:
+        Tabela com a mensagem redigida e as colunas guard_injection,
+        guard_fora_tema e pii
+    """
+    lotes = []
+    for lote in tabela.to_batches(max_chunksize=tamanho_lote):
+        resultados = preprocessar_lote(lote.column("mensagem").to_pylist())
+        colunas = {nome: lote.column(nome) for nome in lote.schema.names}
+        colunas["mensagem"] = pa.array([r.redigido for r in resultados], pa.string())
+        colunas["guard_injection"] = pa.array([r.is_injection for r in resultados], pa.bool_())
+        colunas["guard_fora_tema"] = pa.array(
+            [not r.is_injection and not r.is_valid for r in resultados], pa.bool_()
+        )
+        colunas["pii"] = pa.array([list(r.pii) for r in resultados], pa.list_(pa.string()))
+        lotes.append(pa.table(colunas))
+
+    if not lotes:
+        vazia = {nome: tabela.column(nome) for nome in tabela.schema.names}
+        vazia.update({
+            "guard_injection": pa.array([], pa.bool_()),
+            "guard_fora_tema": pa.array([], pa.bool_()),
+            "pii": pa.array([], pa.list_(pa.string())),
+        })
+        return pa.table(vazia)
+    return pa.concat_tables(lotes)
+
+
+def estatisticas_guards(tabela: pa.Table) -> Dict[str, Any]:
+    """
+    Calcula contagens e taxas de bloqueio dos guards e de perguntas sem resposta.
+
+    Args:
+        tabela: Tabela retornada por classificar_respostas
+
+    Returns:
+        Dicionário com total, contagens e taxas
+    """
+    total = tabela.num_rows
+    stats = {"total": total}
+    for coluna in ("injection", "fora_tema", "sem_resposta"):
+        contagem = pc.sum(tabela[coluna]).as_py() or 0
+        stats[coluna] = contagem
+        stats[f"taxa_{coluna}"] = contagem / total if total else 0.0
+    stats["respondidas"] = total - stats["injection"] - stats["fora_tema"] - stats["sem_resposta"]
+    return stats
+
+
+def perguntas_frequentes(tabela: pa.Table, n: int = 20) -> List[Dict[str, Any]]:
+    """
+    Lista as perguntas mais frequentes (após normalização).
+
+    Args:
+        tabela: Tabela com a coluna mensagem
+        n: Quantidade de perguntas
+
+    Returns:
+        Lista de {"pergunta", "contagem"} em ordem decrescente
+    """
+    contagens = pc.value_counts(normalizar_texto(tabela["mensagem"]))
+    # Nulas e vazias não ocupam vagas entre as n primeiras
+    valores = contagens.field("values")
+    contagens = contagens.filter(pc.and_(pc.is_valid(valores), pc.not_equal(valores, "")))
+    if len(contagens) == 0:
+        return []
+    ordem = pc.array_sort_indices(contagens.field("counts"), order="descending")[:n]
+    return [
+        {"pergunta": item["values"], "contagem": item["counts"]}
+        for item in pc.take(contagens, ordem).to_pylist()
+    ]
+
+
+def _tokenizar(textos: pa.Array):
+    """Retorna (tokens, índice da linha de cada token) sem stopwords."""
+    listas = pc.split_pattern(textos, " ")
+    tokens = pc.list_flatten(listas)
+    linhas = pc.list_parent_indices(listas)
+    validos = pc.and_(
+        pc.greater_equal(pc.utf8_length(tokens), 3),
+        pc.invert(pc.is_in(tokens, value_set=pa.array(sorted(STOPWORDS)))),
+    )
+    return pc.filter(tokens, validos), pc.filter(linhas, validos)
+
+
+def termos_fora_do_tema(tabela: pa.Table, n: int = 30) -> List[Dict[str, Any]]:
+    """
+    Termos frequentes em perguntas bloqueadas pelo validador de tema.
+
+    Termos automotivos que aparecem aqui são candidatos a entrar em
+    ALLOWED_TOPICS.
+
+    Args:
+        tabela: Tabela retornada por classificar_respostas
+        n: Quantidade de termos
+
+    Returns:
+        Lista de {"termo", "contagem"} em ordem decrescente
+    """
+    bloqueadas = tabela.filter(tabela["fora_tema"])
+    tokens, _ = _tokenizar(normalizar_texto(bloqueadas["mensagem"]))
+    tokens = pc.filter(tokens, pc.invert(pc.is_in(tokens, value_set=pa.array(ALLOWED_TOPICS))))
+    contagens = pc.value_counts(tokens)
+    if len(contagens) == 0:
+        return []
+    ordem = pc.array_sort_indices(contagens.field("counts"), order="descending")[:n]
+    return [
+        {"termo": item["values"], "contagem": item["counts"]}
+        for item in pc.take(contagens, ordem).to_pylist()
+    ]
+
+
+def _matriz_termos(textos: pa.Array, vocabulario: int):
+    """Matriz TF (linhas x termos mais frequentes) e os termos correspondentes."""
+    tokens, linhas = _tokenizar(textos)
+    codificados = pc.dictionary_encode(tokens)
+    indices = codificados.indices.to_numpy(zero_copy_only=False)
+    termos = codificados.dictionary.to_pylist()
+
+    frequencia = np.bincount(indices, minlength=len(termos))
+    mais_frequentes = np.argsort(-frequencia)[:vocabulario]
+    mapa = np.full(len(termos), -1)
+    mapa[mais_frequentes] = np.arange(len(mais_frequentes))
+
+    colunas = mapa[indices]
+    dentro = colunas >= 0
+    matriz = np.zeros((len(textos), len(mais_frequentes)), dtype=np.float32)
+    np.add.at(matriz, (linhas.to_numpy(zero_copy_only=False)[dentro], colunas[dentro]), 1.0)
+
+    # IDF para reduzir o peso de termos presentes em quase todas as perguntas
+    df = np.count_nonzero(matriz, axis=0)
+    matriz *= np.log((1 + len(textos)) / (1 + df)) + 1
+    return matriz, [termos[i] for i in mais_frequentes]
+
+
+def _kmeans(vetores: np.ndarray, pesos: np.ndarray, k: int, iteracoes: int, seed: int):
+    """
+    K-means esférico (similaridade de cosseno) com inicialização k-means++.
+
+    Vetores nulos e vetores sem similaridade positiva com nenhum centro
+    ficam sem grupo (rótulo -1). Um grupo que fica vazio recomeça na
+    pergunta mais distante do seu centro.
+    """
+    rng = np.random.default_rng(seed)
+    normas = np.linalg.norm(vetores, axis=1, keepdims=True)
+    vetores = vetores / np.maximum(normas, 1e-12)
+    # Vetores nulos não podem ser sorteados como centro
+    pesos_sorteio = pesos * (normas[:, 0] > 0)
+
+    centros = [vetores[rng.choice(len(vetores), p=pesos_sorteio / pesos_sorteio.sum())]]
+    for _ in range(1, k):
+        distancia = 1 - np.max(vetores @ np.array(centros).T, axis=1)
+        probabilidade = np.maximum(distancia, 0) * pesos_sorteio
+        if probabilidade.sum() == 0:
+            break
+        centros.append(vetores[rng.choice(len(vetores), p=probabilidade / probabilidade.sum())])
+    centros = np.array(centros)
+
+    rotulos = np.full(len(vetores), -1, dtype=np.int64)
+    for iteracao in range(iteracoes):
+        similaridades = vetores @ centros.T
+        novos = np.argmax(similaridades, axis=1)
+        melhor = similaridades[np.arange(len(vetores)), novos]
+        novos[melhor <= 0] = -1
+        if iteracao > 0 and np.array_equal(novos, rotulos):
+            break
+        rotulos = novos
+
+        atribuidos = rotulos >= 0
+        soma = np.zeros_like(centros)
+        np.add.at(soma, rotulos[atribuidos], (vetores * pesos[:, None])[atribuidos])
+        normas = np.linalg.norm(soma, axis=1, keepdims=True)
+        centros = np.where(normas > 0, soma / np.maximum(normas, 1e-12), centros)
+
+        vazios = np.flatnonzero(normas[:, 0] == 0)
+        if len(vazios):
+            # Recomeça nos vetores não nulos mais distantes do seu centro
+            candidatos = np.argsort(np.where(pesos_sorteio > 0, melhor, np.inf))[:len(vazios)]
+            candidatos = candidatos[pesos_sorteio[candidatos] > 0]
+            centros[vazios[:len(candidatos)]] = vetores[candidatos]
+
+    return vetores, centros, rotulos
+
+
+def agrupar_perguntas(
+    tabela: pa.Table,
+    n_grupos: int = 20,
+    embeddings=None,
+    max_perguntas: int = 20_000,
+    vocabulario: int = 2_000,
+    iteracoes: int = 30,
+    seed: int = 0,
+    tentativas: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Agrupa perguntas semelhantes com k-means.
+
+    As perguntas são deduplicadas após normalização e ponderadas pela
+    frequência. Sem ``embeddings`` usa TF-IDF sobre os termos mais
+    frequentes; com ``embeddings`` (ex.: create_embeddings()) usa vetores
+    semânticos.
+
+    Args:
+        tabela: Tabela retornada por classificar_respostas
+        n_grupos: Número de grupos
+        embeddings: Modelo de embeddings LangChain (opcional)
+        max_perguntas: Limite de perguntas distintas (as mais frequentes)
+        vocabulario: Número de termos do TF-IDF
+        iteracoes: Iterações máximas do k-means
+        seed: Semente para reprodutibilidade
+        tentativas: Inicializações do k-means; fica a de maior coesão
+
+    Returns:
+        Grupos ordenados por tamanho, com exemplo, termos principais e
+        taxas de bloqueio e de perguntas sem resposta. Perguntas sem termos
+        úteis (ex.: "oi", "obrigado") ou sem termos em comum com nenhum grupo
+        vêm por último, em uma entrada com "grupo": -1
+    """
+    normalizadas = normalizar_texto(tabela["mensagem"])
+    agregada = (
+        pa.table({
+            "pergunta": normalizadas,
+            "fora_tema": pc.cast(tabela["fora_tema"], pa.int64()),
+            "sem_resposta": pc.cast(tabela["sem_resposta"], pa.int64()),
+        })
+        .filter(pc.not_equal(normalizadas, ""))
+        .group_by("pergunta")
+        .aggregate([("pergunta", "count"), ("fora_tema", "sum"), ("sem_resposta", "sum")])
+        .sort_by([("pergunta_count", "descending")])
+        .slice(0, max_perguntas)
+    )
+    if agregada.num_rows == 0:
+        return []
+
+    textos = agregada["pergunta"].combine_chunks()
+    pesos = agregada["pergunta_count"].to_numpy().astype(np.float64)
+
+    matriz_tf, termos = _matriz_termos(textos, vocabulario)
+    if embeddings is not None:
+        vetores = np.asarray(embeddings.embed_documents(textos.to_pylist()), dtype=np.float32)
+    else:
+        vetores = matriz_tf
+
+    # Perguntas só com stopwords viram vetores nulos e ficam fora do k-means
+    nao_nulos = int(np.count_nonzero(np.linalg.norm(vetores, axis=1) > 0))
+    if nao_nulos:
+        melhor = None
+        for tentativa in range(max(1, tentativas)):
+            normalizados, centros, rotulos = _kmeans(
+                vetores, pesos, min(n_grupos, nao_nulos), iteracoes, seed + tentativa
+            )
+            atribuidos = rotulos >= 0
+            coesao = np.sum(pesos[atribuidos] * np.einsum(
+                "ij,ij->i", normalizados[atribuidos], centros[rotulos[atribuidos]]
+            ))
+            if melhor is None or coesao > melhor[0]:
+                melhor = (coesao, normalizados, centros, rotulos)
+        _, vetores, centros, rotulos = melhor
+    else:
+        centros = np.zeros((0, vetores.shape[1]), dtype=vetores.dtype)
+        rotulos = np.full(len(vetores), -1, dtype=np.int64)
+
+    # Estatísticas por grupo, todas via bincount; o índice n reúne as perguntas sem grupo
+    n = len(centros)
+    rotulos = np.where(rotulos >= 0, rotulos, n)
+    centros = np.vstack([centros, np.zeros((1, vetores.shape[1]), dtype=centros.dtype)])
+    tamanho = np.bincount(rotulos, weights=pesos, minlength=n + 1)
+    fora_tema = np.bincount(rotulos, weights=agregada["fora_tema_sum"].to_numpy(), minlength=n + 1)
+    sem_resposta = np.bincount(rotulos, weights=agregada["sem_resposta_sum"].to_numpy(), minlength=n + 1)
+    similaridade = np.einsum("ij,ij->i", vetores, centros[rotulos])
+
+    termos_por_grupo = np.zeros((n + 1, matriz_tf.shape[1]), dtype=np.float32)
+    np.add.at(termos_por_grupo, rotulos, matriz_tf * pesos[:, None].astype(np.float32))
+
+    grupos = []
+    for grupo in [*np.argsort(-tamanho[:n]), n]:
+        membros = np.flatnonzero(rotulos == grupo)
+        if len(membros) == 0:
+            continue
+        # Sem grupo não há centro: o exemplo é a pergunta mais frequente
+        criterio = pesos if grupo == n else similaridade
+        exemplo = membros[np.argmax(criterio[membros])]
+        principais = np.argsort(-termos_por_grupo[grupo])[:5]
+        grupos.append({
+            "grupo": int(grupo) if grupo < n else -1,
+            "tamanho": int(tamanho[grupo]),
+            "perguntas_distintas": len(membros),
+            "exemplo": textos[int(exemplo)].as_py(),
+            "termos": [termos[i] for i in principais if termos_por_grupo[grupo, i] > 0],
+            "taxa_fora_tema": float(fora_tema[grupo] / tamanho[grupo]),
+            "taxa_sem_resposta": float(sem_resposta[grupo] / tamanho[grupo]),
+        })
+    return grupos
+
+
+def gerar_relatorio(
+    tabela: pa.Table,
+    n_grupos: int = 20,
+    embeddings=None,
+    seed: Optional[int] = 0
+) -> Dict[str, Any]:
+    """
+    Executa todas as análises sobre as conversas exportadas.
+
+    Args:
+        tabela: Tabela retornada por carregar_conversas
+        n_grupos: Número de grupos de perguntas
+        embeddings: Modelo de embeddings (opcional)
+        seed: Semente do k-means
+
+    Returns:
+        Dicionário com guards, perguntas_frequentes, termos_fora_do_tema e grupos
+    """
+    classificada = classificar_respostas(tabela)
+    return {
+        "guards": estatisticas_guards(classificada),
+        "perguntas_frequentes": perguntas_frequentes(classificada),
+        "termos_fora_do_tema": termos_fora_do_tema(classificada),
+        "grupos": agrupar_perguntas(classificada, n_grupos, embeddings, seed=seed or 0),
+    }
@@ -0,0 +1,153 @@
+"""Exportação incremental da tabela conversas para Parquet."""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.chatbot_oficina.database.repository import listar_conversas_pagina
+
+
+SCHEMA_CONVERSAS = pa.schema([
+    ("id", pa.int64()),
+    ("cliente_id", pa.int64()),
+    ("mensagem", pa.string()),
+    ("resposta", pa.string()),
+    ("created_at", pa.timestamp("us")),
+])
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def _ler_checkpoint(caminho: Path) -> Dict[str, int]:
+    if caminho.exists():
+        return json.loads(caminho.read_text(encoding="utf-8"))
+    return {"ultimo_id": 0, "partes": 0, "linhas": 0}
+
+
+def _salvar_checkpoint(caminho: Path, checkpoint: Dict[str, int]):
+    """Grava o checkpoint de forma atômica (escreve e renomeia)."""
+    temporario = caminho.with_suffix(".tmp")
+    temporario.write_text(json.dumps(checkpoint), encoding="utf-8")
+    os.replace(temporario, caminho)
+
+
+def _para_tabela(linhas: List[Dict[str, Any]]) -> pa.Table:
+    """Converte uma página do Supabase em tabela Arrow com o schema fixo."""
+    colunas = {}
+    for campo in SCHEMA_CONVERSAS:
+        valores = [linha.get(campo.name) for linha in linhas]
+        if pa.types.is_timestamp(campo.type):
+            colunas[campo.name] = pc.cast(pa.array(valores, pa.string()), campo.type)
+        else:
+            colunas[campo.name] = pa.array(valores, campo.type)
+    return pa.Table.from_pydict(colunas, schema=SCHEMA_CONVERSAS)
+
+
+def exportar_conversas(
+    destino: str,
+    tamanho_pagina: int = 1000,
+    linhas_por_arquivo: int = 100_000,
+    pausa: float = 0.0,
+    compressao: str = "zstd",
+    buscar_pagina: Callable[[int, int], List[Dict[str, Any]]] = None,
+    progresso: Optional[Callable[[Dict[str, int]], None]] = None
+) -> Dict[str, int]:
+    """
+    Exporta a tabela conversas para arquivos Parquet, retomando de onde parou.
+
+    Percorre a tabela por keyset (id crescente), escrevendo cada página como
+    um row group. A cada ``linhas_por_arquivo`` linhas o arquivo é fechado,
+    renomeado para ``conversas-NNNNN.parquet`` e o checkpoint é atualizado;
+    se a exportação for interrompida, a próxima execução reescreve apenas o
+    arquivo incompleto.
+
+    Args:
+        destino: Diretório de saída
+        tamanho_pagina: Linhas por consulta ao banco
+        linhas_por_arquivo: Linhas por arquivo Parquet
+        pausa: Espera entre páginas, em segundos, para aliviar o banco
+        compressao: Codec do Parquet (zstd, snappy, gzip...)
+        buscar_pagina: Função (apos_id, limite) -> linhas; padrão usa o Supabase
+        progresso: Chamado com o checkpoint após cada arquivo fechado
+
+    Returns:
+        Checkpoint final: ultimo_id, partes e linhas exportadas
+    """
+    buscar_pagina = buscar_pagina or (lambda apos_id, limite: listar_conversas_pagina(apos_id, limite))
+
+    pasta = Path(destino)
+    pasta.mkdir(parents=True, exist_ok=True)
+    caminho_checkpoint = pasta / CHECKPOINT_FILE
+    checkpoint = _ler_checkpoint(caminho_checkpoint)
+
+    writer = None
+    arquivo_temporario = None
+    linhas_arquivo = 0
+    ultimo_id = checkpoint["ultimo_id"]
+
+    def fechar_arquivo():
+        nonlocal writer, linhas_arquivo
+        writer.close()
+        os.replace(arquivo_temporario, pasta / f"conversas-{checkpoint['partes']:05d}.parquet")
+        checkpoint["partes"] += 1
+        checkpoint["linhas"] += linhas_arquivo
+        checkpoint["ultimo_id"] = ultimo_id
+        _salvar_checkpoint(caminho_checkpoint, checkpoint)
+        writer = None
+        linhas_arquivo = 0
+        if progresso:
+            progresso(dict(checkpoint))
+
+    try:
+        while True:
+            linhas = buscar_pagina(ultimo_id, tamanho_pagina)
+            if not linhas:
+                break
+
+            if writer is None:
+                arquivo_temporario = pasta / f"conversas-{checkpoint['partes']:05d}.parquet.tmp"
+                writer = pq.ParquetWriter(arquivo_temporario, SCHEMA_CONVERSAS, compression=compressao)
+
+            writer.write_table(_para_tabela(linhas))
+            linhas_arquivo += len(linhas)
+            ultimo_id = linhas[-1]["id"]
+
+            if linhas_arquivo >= linhas_por_arquivo:
+                fechar_arquivo()
+
+            if len(linhas) < tamanho_pagina:
+                break
+            if pausa > 0:
+                time.sleep(pausa)
+
+        if writer is not None:
+            fechar_arquivo()
+    finally:
+        # Interrompido no meio de um arquivo: descarta a parte incompleta
+        if writer is not None:
+            writer.close()
+            Path(arquivo_temporario).unlink(missing_ok=True)
+
+    return checkpoint
+
+
+def carregar_conversas(origem: str, colunas: Optional[List[str]] = None) -> pa.Table:
+    """
+    Carrega os arquivos Parquet exportados como uma única tabela Arrow.
+
+    Args:
+        origem: Diretório usado em exportar_conversas
+        colunas: Colunas a carregar (padrão: todas)
+
+    Returns:
+        Tabela com todas as conversas exportadas
+    """
+    arquivos = sorted(Path(origem).glob("conversas-*.parquet"))
+    if not arquivos:
+        return SCHEMA_CONVERSAS.empty_table().select(colunas or SCHEMA_CONVERSAS.names)
+    return pa.concat_tables(pq.read_table(arquivo, columns=colunas) for arquivo in arquivos)
@@ -1,16 +1,28 @@
 """Módulo para configuração do modelo Ollama Cloud."""
 import os
+from typing import Optional
 from dotenv import load_dotenv
 from langchain_ollama import ChatOllama
 
 load_dotenv()
 
 
-def get_llm(model_name: str = "gemma3:4b", temperature: float = 0.7):
-    """Configura o modelo Ollama Cloud."""
+def get_llm(
+    model_name: str = "gemma3:4b",
+    temperature: float = 0.7,
+    base_url: Optional[str] = None
+):
+    """
+    Configura o modelo Ollama Cloud.
+    
+    Args:
+        model_name: Nome do modelo
+        temperature: Temperatura de amostragem
+        base_url: URL do servidor Ollama (padrão: OLLAMA_BASE_URL ou Ollama Cloud)
+    """
     return ChatOllama(
         model=model_name,
         temperature=temperature,
-        base_url="https://ollama.com",
+        base_url=base_url or os.getenv("OLLAMA_BASE_URL", "https://ollama.com"),
         api_key=os.getenv("OLLAMA_API_KEY", ""),
     )
@@ -0,0 +1,60 @@
+"""Pipeline de processamento de uma mensagem do chat."""
+from dataclasses import dataclass
+from typing import Optional
+
+from src.chatbot_oficina.guards.preprocess import preprocessar
+from src.chatbot_oficina.database.repository import salvar_conversa
+
+
+@dataclass
+class RespostaChat:
+    """Resposta de uma mensagem processada."""
+    origem: str
+    resposta: str
+    redigido: str
+    conversa_id: Optional[int] = None
+    erro_persistencia: Optional[str] = None
+
+
+def processar_mensagem(
+    prompt: str,
+    rag_chain,
+    cliente_id: Optional[int] = None
+) -> RespostaChat:
+    """
+    Processa uma mensagem: guards, chain RAG e persistência.
+
+    A mensagem passa pelo pré-processamento uma única vez; o LLM e o banco
+    recebem o texto com dados pessoais redigidos. Uma falha ao salvar a
+    conversa não descarta a resposta: fica em ``erro_persistencia``.
+
+    Args:
+        prompt: Mensagem do usuário
+        rag_chain: Chain RAG já inicializada
+        cliente_id: ID do cliente logado (None ou 0 para anônimo)
+
+    Returns:
+        RespostaChat com origem ("injection", "topic" ou "rag"), resposta,
+        prompt redigido e ID da conversa salva
+
+    Raises:
+        Exception: Se a chain RAG falhar
+    """
+    resultado = preprocessar(prompt)
+    if resultado.is_injection:
+        origem, resposta = "injection", resultado.mensagem
+    elif not resultado.is_valid:
+        origem, resposta = "topic", resultado.mensagem
+    else:
+        origem, resposta = "rag", rag_chain.invoke(resultado.redigido)
+
+    resposta_chat = RespostaChat(origem, resposta, resultado.redigido)
+
+    # Salvar no banco se cliente logado
+    if cliente_id and cliente_id > 0:
+        try:
+            resposta_chat.conversa_id = salvar_conversa(cliente_id, resultado.redigido, resposta)
+        except Exception as e:
+            resposta_chat.erro_persistencia = str(e)
+
+    return resposta_chat
@@ -137,6 +137,73 @@ def listar_conversas_cliente(cliente_id: int, limite: int = 50) -> List[Dict[str
     return response.data or []
 
 
+def listar_conversas_anteriores(
+    cliente_id: int,
+    antes_id: Optional[int] = None,
+    limite: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Lista as conversas de um cliente anteriores a uma conversa (keyset por id).
+    
+    Usada para carregar o histórico aos poucos, da mais recente para a
+    mais antiga.
+    
+    Args:
+        cliente_id: ID do cliente
+        antes_id: Retorna apenas conversas com id menor que este (None = mais recentes)
+        limite: Número máximo de conversas
+    
+    Returns:
+        Lista de conversas (id, mensagem, resposta) em ordem decrescente de id
+    """
+    client = get_supabase_client()
+    
+    query = (
+        client.table("conversas")
+        .select("id,mensagem,resposta")
+        .eq("cliente_id", cliente_id)
+    )
+    if antes_id is not None:
+        query = query.lt("id", antes_id)
+    
+    response = query.order("id", desc=True).limit(limite).execute()
+    
+    return response.data or []
+
+
+def listar_conversas_pagina(
+    apos_id: int = 0,
+    limite: int = 1000,
+    colunas: str = "id,cliente_id,mensagem,resposta,created_at"
+) -> List[Dict[str, Any]]:
+    """
+    Lista uma página de conversas de todos os clientes por keyset (id).
+    
+    Ao contrário de offset, o custo de cada página não cresce com a
+    posição: a consulta usa o índice da chave primária a partir de apos_id.
+    
+    Args:
+        apos_id: Retorna apenas conversas com id maior que este
+        limite: Tamanho da página
+        colunas: Colunas selecionadas
+    
+    Returns:
+        Lista de conversas ordenada por id
+    """
+    client = get_supabase_client()
+    
+    response = (
+        client.table("conversas")
+        .select(colunas)
+        .gt("id", apos_id)
+        .order("id")
+        .limit(limite)
+        .execute()
+    )
+    
+    return response.data or []
+
+
 def atualizar_cliente(cliente_id: int, **kwargs) -> bool:
     """
     Atualiza dados de um cliente.
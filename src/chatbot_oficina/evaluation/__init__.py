@@ -0,0 +1 @@
+"""Módulo de avaliação do retrieval."""
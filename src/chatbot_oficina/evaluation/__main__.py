@@ -0,0 +1,133 @@
+"""Compara configurações de índice pela linha de comando.
+
+Exemplo:
+    python -m src.chatbot_oficina.evaluation --chunk-sizes 300,500,800 --ks 1,3,5 \
+        --indices "Flat;HNSW32|efSearch=16;HNSW32|efSearch=64" --csv resultados/avaliacao.csv
+"""
+import argparse
+import csv
+import math
+import sys
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import List
+
+from src.chatbot_oficina.evaluation.harness import (
+    DATA_PATH, PERGUNTAS_PATH, Configuracao, Resultado, avaliar_grade, carregar_perguntas,
+    montar_grade
+)
+
+
+# (título, largura, formato, campo)
+COLUNAS = [
+    ("Modelo", 28, "", "modelo"),
+    ("Chunk", 6, "", "chunk_size"),
+    ("Overl", 6, "", "chunk_overlap"),
+    ("Índice", 10, "", "indice"),
+    ("Busca", 12, "", "parametros"),
+    ("k", 3, "", "k"),
+    ("Recall", 7, ".3f", "recall"),
+    ("MRR", 7, ".3f", "mrr"),
+    ("Cobert", 7, ".2f", "cobertura"),
+    ("Build s", 8, ".2f", "construcao"),
+    ("Disco KB", 9, ".0f", "disco_kb"),
+    ("Mem MB", 7, ".0f", "memoria_mb"),
+    ("p50 ms", 7, ".2f", "latencia_p50_ms"),
+    ("p95 ms", 7, ".2f", "latencia_p95_ms"),
+]
+
+
+def formatar_tabela(resultados: List[Resultado]) -> str:
+    """Tabela ordenada por recall, MRR e latência p95."""
+    ordenados = sorted(
+        resultados,
+        key=lambda r: (
+            -(0 if math.isnan(r.recall) else r.recall),
+            -(0 if math.isnan(r.mrr) else r.mrr),
+            r.latencia_p95_ms,
+        ),
+    )
+
+    cabecalho = " ".join(f"{titulo:>{largura}}" for titulo, largura, _, _ in COLUNAS)
+    linhas = [cabecalho, "-" * len(cabecalho)]
+    for resultado in ordenados:
+        valores = asdict(resultado)
+        valores["modelo"] = valores["modelo"].split("/")[-1][:28]
+        linha = " ".join(
+            f"{valores[campo]:>{largura}{formato}}" if valores[campo] is not None else f"{'-':>{largura}}"
+            for _, largura, formato, campo in COLUNAS
+        )
+        if resultado.erro:
+            linha += f"  ERRO: {resultado.erro.splitlines()[0][:80]}"
+        linhas.append(linha)
+    return "\n".join(linhas)
+
+
+def salvar_csv(resultados: List[Resultado], caminho: str):
+    """Salva os resultados em CSV."""
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        writer = csv.DictWriter(arquivo, fieldnames=[campo.name for campo in fields(Resultado)])
+        writer.writeheader()
+        writer.writerows(asdict(resultado) for resultado in resultados)
+
+
+def _lista(valor: str, tipo=str, separador: str = ",") -> list:
+    return [tipo(item.strip()) for item in valor.split(separador) if item.strip()]
+
+
+def main(argv=None):
+    padrao = Configuracao()
+    parser = argparse.ArgumentParser(description="Avaliação offline do retrieval")
+    parser.add_argument("--perguntas", default=PERGUNTAS_PATH,
+                        help="JSONL com pares pergunta/trecho esperado")
+    parser.add_argument("--documentos", default=DATA_PATH)
+    parser.add_argument("--modelos", default=padrao.modelo, help="Modelos de embeddings")
+    parser.add_argument("--chunk-sizes", default="300,500,800")
+    parser.add_argument("--overlaps", default="50,100")
+    parser.add_argument("--indices", default="Flat;HNSW32",
+                        help="Descrições de índice FAISS (index_factory) separadas por ';', "
+                             "com parâmetros de busca opcionais após '|' (ex.: HNSW32|efSearch=64)")
+    parser.add_argument("--ks", default="1,3,5")
+    parser.add_argument("--processos", type=int, help="Processos em paralelo (padrão: núcleos)")
+    parser.add_argument("--online", action="store_true",
+                        help="Permite baixar modelos que não estão no cache local")
+    parser.add_argument("--csv", help="Salva os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    perguntas = carregar_perguntas(args.perguntas)
+    configuracoes = montar_grade(
+        _lista(args.modelos),
+        _lista(args.chunk_sizes, int),
+        _lista(args.overlaps, int),
+        _lista(args.indices, separador=";"),
+    )
+    ks = _lista(args.ks, int)
+
+    def progresso(parciais):
+        resultado = parciais[-1]
+        situacao = resultado.erro or f"recall@{resultado.k} {resultado.recall:.3f}"
+        print(
+            f"{resultado.modelo} chunk={resultado.chunk_size}/{resultado.chunk_overlap} "
+            f"{' '.join(filter(None, [resultado.indice, resultado.parametros]))}: {situacao}",
+            file=sys.stderr,
+        )
+
+    print(f"{len(configuracoes)} configurações, {len(perguntas)} perguntas", file=sys.stderr)
+    resultados = avaliar_grade(
+        configuracoes,
+        perguntas,
+        ks,
+        processos=args.processos,
+        offline=not args.online,
+        data_path=args.documentos,
+        callback=progresso,
+    )
+    print(formatar_tabela(resultados))
+
+    if args.csv:
+        salvar_csv(resultados, args.csv)
+
+
+if __name__ == "__main__":
+    main()
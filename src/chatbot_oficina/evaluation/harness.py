@@ -0,0 +1,287 @@
+"""Avaliação offline de qualidade e latência da recuperação (retrieval).
+
+Cada configuração da grade constrói seu índice com ``split_documents`` e
+``create_vectorstore`` em um processo separado, o que permite rodar várias
+configurações em paralelo e medir a memória de cada uma isoladamente.
+"""
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+DATA_PATH = "data/documentos"
+PERGUNTAS_PATH = "data/avaliacao/perguntas.jsonl"
+
+
+@dataclass(frozen=True)
+class Configuracao:
+    """Parâmetros que exigem a construção de um índice novo."""
+    modelo: str = "sentence-transformers/all-MiniLM-L6-v2"
+    chunk_size: int = 500
+    chunk_overlap: int = 100
+    indice: str = "Flat"
+    parametros: str = ""
+
+
+@dataclass
+class Resultado:
+    """Métricas de uma configuração para um valor de k."""
+    modelo: str
+    chunk_size: int
+    chunk_overlap: int
+    indice: str
+    parametros: str
+    k: int
+    chunks: int
+    cobertura: float
+    recall: float
+    mrr: float
+    carga_modelo: float
+    construcao: float
+    disco_kb: float
+    memoria_mb: Optional[float]
+    latencia_p50_ms: float
+    latencia_p95_ms: float
+    erro: Optional[str] = None
+
+
+def carregar_perguntas(caminho: str = PERGUNTAS_PATH) -> List[Dict[str, str]]:
+    """
+    Carrega o conjunto rotulado de perguntas.
+
+    Cada linha do arquivo JSONL tem "pergunta" e "trecho", um trecho do FAQ
+    que deve aparecer em algum dos documentos recuperados.
+
+    Args:
+        caminho: Arquivo JSONL
+
+    Returns:
+        Lista de {"pergunta", "trecho"}
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+
+def montar_grade(
+    modelos: List[str],
+    chunk_sizes: List[int],
+    chunk_overlaps: List[int],
+    indices: List[str]
+) -> List[Configuracao]:
+    """
+    Produto cartesiano dos parâmetros, sem repetições e ignorando overlap >= chunk_size.
+
+    Cada índice pode trazer parâmetros de busca após "|", no formato do
+    faiss.ParameterSpace: "HNSW32|efSearch=64", "IVF16,Flat|nprobe=4".
+    """
+    grade = (
+        Configuracao(modelo, chunk_size, overlap, indice.strip(), parametros.strip())
+        for modelo, chunk_size, overlap, (indice, _, parametros)
+        in itertools.product(modelos, chunk_sizes, chunk_overlaps, (i.partition("|") for i in indices))
+        if overlap < chunk_size
+    )
+    return list(dict.fromkeys(grade))
+
+
+def _normalizar(texto: str) -> str:
+    return " ".join(texto.lower().split())
+
+
+def _tamanho_diretorio(caminho: Path) -> int:
+    return sum(arquivo.stat().st_size for arquivo in caminho.rglob("*") if arquivo.is_file())
+
+
+def _memoria_pico_mb() -> Optional[float]:
+    """Pico de memória residente do processo atual, em MB."""
+    if resource is None:
+        return None
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def avaliar_configuracao(
+    configuracao: Configuracao,
+    perguntas: List[Dict[str, str]],
+    ks: List[int],
+    data_path: str = DATA_PATH,
+    diretorio: Optional[str] = None
+) -> List[Resultado]:
+    """
+    Constrói o índice de uma configuração e mede recall@k, MRR e latência.
+
+    O índice é consultado uma vez por pergunta com o maior k; as métricas dos
+    demais valores de k são calculadas sobre o mesmo ranking.
+
+    Args:
+        configuracao: Modelo, chunking, tipo de índice e parâmetros de busca
+        perguntas: Conjunto rotulado (ver carregar_perguntas)
+        ks: Valores de k avaliados
+        data_path: Diretório dos documentos
+        diretorio: Onde salvar o índice (padrão: diretório temporário removido ao final)
+
+    Returns:
+        Um Resultado por valor de k
+    """
+    from src.chatbot_oficina.rag.loader import load_documents, split_documents
+    from src.chatbot_oficina.rag.vectorstore import create_embeddings, create_vectorstore
+
+    persist_directory = Path(diretorio or tempfile.mkdtemp(prefix="avaliacao_"))
+    try:
+        inicio = time.perf_counter()
+        embeddings = create_embeddings(configuracao.modelo)
+        # Força o carregamento completo antes de medir a construção
+        embeddings.embed_query("aquecimento")
+        carga_modelo = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        chunks = split_documents(
+            load_documents(data_path), configuracao.chunk_size, configuracao.chunk_overlap
+        )
+        vectorstore = create_vectorstore(
+            chunks, embeddings, str(persist_directory),
+            index_factory=configuracao.indice, search_params=configuracao.parametros or None
+        )
+        construcao = time.perf_counter() - inicio
+        disco_kb = _tamanho_diretorio(persist_directory) / 1024
+
+        textos_chunks = [_normalizar(chunk.page_content) for chunk in chunks]
+        trechos = [_normalizar(item["trecho"]) for item in perguntas]
+        cobertura = sum(
+            any(trecho in texto for texto in textos_chunks) for trecho in trechos
+        ) / len(perguntas)
+
+        k_maximo = min(max(ks), len(chunks))
+        latencias = []
+        posicoes = []
+        for item, trecho in zip(perguntas, trechos):
+            inicio = time.perf_counter()
+            documentos = vectorstore.similarity_search(item["pergunta"], k=k_maximo)
+            latencias.append(time.perf_counter() - inicio)
+
+            posicao = next(
+                (i for i, doc in enumerate(documentos, start=1)
+                 if trecho in _normalizar(doc.page_content)),
+                None
+            )
+            posicoes.append(posicao)
+
+        memoria_mb = _memoria_pico_mb()
+        resultados = []
+        for k in sorted(ks):
+            acertos = [p for p in posicoes if p is not None and p <= k]
+            resultados.append(Resultado(
+                **asdict(configuracao),
+                k=k,
+                chunks=len(chunks),
+                cobertura=cobertura,
+                recall=len(acertos) / len(perguntas),
+                mrr=sum(1 / p for p in acertos) / len(perguntas),
+                carga_modelo=carga_modelo,
+                construcao=construcao,
+                disco_kb=disco_kb,
+                memoria_mb=memoria_mb,
+                latencia_p50_ms=1000 * float(np.percentile(latencias, 50)),
+                latencia_p95_ms=1000 * float(np.percentile(latencias, 95)),
+            ))
+        return resultados
+    finally:
+        if diretorio is None:
+            shutil.rmtree(persist_directory, ignore_errors=True)
+
+
+def _iniciar_worker(threads: int, offline: bool):
+    """Limita as threads de cada processo e impede downloads de modelos."""
+    for variavel in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variavel] = str(threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    if offline:
+        os.environ["HF_HUB_OFFLINE"] = "1"
+        os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+
+def _resultado_com_erro(configuracao: Configuracao, ks: List[int], erro: Exception) -> List[Resultado]:
+    nan = float("nan")
+    return [
+        Resultado(
+            **asdict(configuracao), k=k, chunks=0, cobertura=nan, recall=nan, mrr=nan,
+            carga_modelo=nan, construcao=nan, disco_kb=nan, memoria_mb=None,
+            latencia_p50_ms=nan, latencia_p95_ms=nan, erro=f"{type(erro).__name__}: {erro}",
+        )
+        for k in sorted(ks)
+    ]
+
+
+def avaliar_grade(
+    configuracoes: List[Configuracao],
+    perguntas: List[Dict[str, str]],
+    ks: List[int],
+    processos: Optional[int] = None,
+    offline: bool = True,
+    data_path: str = DATA_PATH,
+    callback: Optional[Callable[[List[Resultado]], None]] = None
+) -> List[Resultado]:
+    """
+    Avalia todas as configurações em paralelo, uma por processo.
+
+    Cada processo atende uma única configuração (max_tasks_per_child=1),
+    para que o pico de memória medido seja só daquela configuração, e usa
+    ``núcleos / processos`` threads para não disputar CPU com os demais.
+
+    Args:
+        configuracoes: Grade de configurações (ver montar_grade)
+        perguntas: Conjunto rotulado
+        ks: Valores de k avaliados
+        processos: Processos em paralelo (padrão: núcleos disponíveis)
+        offline: Usa apenas modelos já presentes no cache local
+        data_path: Diretório dos documentos
+        callback: Chamado com os resultados de cada configuração concluída
+
+    Returns:
+        Resultados de todas as configurações e valores de k
+    """
+    nucleos = os.cpu_count() or 1
+    processos = max(1, min(processos or nucleos, len(configuracoes)))
+    threads = max(1, nucleos // processos)
+
+    resultados = []
+    with ProcessPoolExecutor(
+        max_workers=processos,
+        initializer=_iniciar_worker,
+        initargs=(threads, offline),
+        max_tasks_per_child=1,
+    ) as executor:
+        futuros = {
+            executor.submit(avaliar_configuracao, configuracao, perguntas, ks, data_path): configuracao
+            for configuracao in configuracoes
+        }
+        for futuro in as_completed(futuros):
+            try:
+                parciais = futuro.result()
+            except Exception as e:
+                parciais = _resultado_com_erro(futuros[futuro], ks, e)
+            resultados.extend(parciais)
+            if callback:
+                callback(parciais)
+
+    return resultados
@@ -0,0 +1,205 @@
+"""Pré-processamento das mensagens: guards e redação de dados pessoais.
+
+Normaliza o texto uma única vez e executa, sobre ele, a detecção de injection
+e a validação de tema com padrões compilados. O veredito é memoizado por hash
+do texto normalizado. Dados pessoais (telefone, placa, email, CPF) são
+substituídos antes do envio ao LLM e da gravação no banco.
+
+Os padrões são os mesmos de detect_injection e validate_topic, mas a
+normalização (NFC e espaços colapsados) torna os guards um pouco mais
+estritos que essas funções, que só aplicam lower(): "Ignore  previous
+instructions", com espaços extras ou quebra de linha entre as palavras, é
+bloqueado aqui e não por detect_injection, e termos com acentos decompostos
+(NFD) passam a casar com ALLOWED_TOPICS.
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+from src.chatbot_oficina.guards.injection_detector import INJECTION_MESSAGE, INJECTION_PATTERNS
+from src.chatbot_oficina.guards.topic_validator import ALLOWED_TOPICS, REDIRECT_MESSAGE
+
+
+CACHE_SIZE = 4096
+
+PII_PATTERNS = {
+    "EMAIL": r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+",
+    "CPF": r"(?<!\d)\d{3}\.\d{3}\.\d{3}-\d{2}(?!\d)",
+    "PLACA": r"\b[A-Za-z]{3}-?\d[A-Za-z0-9]\d{2}\b",
+    # Exige DDD ou o 9 inicial do celular: números soltos de 8 dígitos
+    # (códigos de peça, notas fiscais) não são telefones
+    "TELEFONE": (
+        r"(?<![\w+])(?:"
+        r"(?:\+?55[\s-]?)?\([1-9]{2}\)\s?9?\d{4}[-\s]?\d{4}"  # (11) 99999-9999
+        r"|(?:\+?55[\s-]?)?[1-9]{2}[\s-]?9\d{4}[-\s]?\d{4}"  # 11 99999-9999, 11999999999
+        r"|\+?55[\s-]?[1-9]{2}[\s-]?\d{4}[-\s]?\d{4}"  # +55 11 3333-4444
+        r"|[1-9]{2}[\s-]\d{4}-\d{4}"  # 11 3333-4444
+        r"|9\d{4}-\d{4}"  # 99999-9999
+        r")(?!\d)"
+    ),
+}
+
+
+def _compilar_padroes():
+    """Um único padrão por guard: uma varredura do texto em vez de uma por termo."""
+    global _INJECTION_REGEX, _TOPIC_REGEX, _PII_REGEX
+    _INJECTION_REGEX = re.compile("|".join(re.escape(p) for p in INJECTION_PATTERNS))
+    _TOPIC_REGEX = re.compile("|".join(re.escape(t) for t in ALLOWED_TOPICS))
+    _PII_REGEX = re.compile("|".join(f"(?P<{nome}>{padrao})" for nome, padrao in PII_PATTERNS.items()))
+
+
+_compilar_padroes()
+
+
+@dataclass(frozen=True)
+class ResultadoGuard:
+    """Resultado do pré-processamento de uma mensagem."""
+    texto: str
+    redigido: str
+    is_injection: bool
+    is_valid: bool
+    mensagem: str
+    pii: Tuple[str, ...] = ()
+
+    @property
+    def bloqueado(self) -> bool:
+        return self.is_injection or not self.is_valid
+
+
+class _LRUCache:
+    """Cache LRU thread-safe (as sessões do Streamlit rodam em threads)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            if chave in self._dados:
+                self._dados.move_to_end(chave)
+                self.hits += 1
+                return self._dados[chave]
+            self.misses += 1
+            return None
+
+    def put(self, chave, valor):
+        with self._lock:
+            self._dados[chave] = valor
+            self._dados.move_to_end(chave)
+            if len(self._dados) > self.maxsize:
+                self._dados.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._dados.clear()
+            self.hits = self.misses = 0
+
+
+_cache = _LRUCache(CACHE_SIZE)
+
+
+def normalizar(texto: str) -> str:
+    """Normaliza o texto: Unicode NFC, minúsculas e espaços colapsados."""
+    return " ".join(unicodedata.normalize("NFC", texto).lower().split())
+
+
+def redigir_pii(texto: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Substitui dados pessoais por marcadores como [TELEFONE].
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        Tuple[str, Tuple[str, ...]]: (texto redigido, tipos encontrados)
+    """
+    encontrados = []
+
+    def substituir(match):
+        encontrados.append(match.lastgroup)
+        return f"[{match.lastgroup}]"
+
+    redigido = _PII_REGEX.sub(substituir, texto)
+    return redigido, tuple(dict.fromkeys(encontrados))
+
+
+def _verificar(normalizado: str) -> Tuple[bool, bool, str]:
+    """Executa os guards sobre o texto normalizado."""
+    if not normalizado:
+        return False, False, REDIRECT_MESSAGE
+    if _INJECTION_REGEX.search(normalizado):
+        return True, False, INJECTION_MESSAGE
+    if not _TOPIC_REGEX.search(normalizado):
+        return False, False, REDIRECT_MESSAGE
+    return False, True, ""
+
+
+def preprocessar(texto: str) -> ResultadoGuard:
+    """
+    Normaliza a mensagem, executa os guards e redige dados pessoais.
+
+    Os guards são avaliados sobre o texto original normalizado, antes da
+    redação, para que os marcadores de PII não alterem o veredito. Por causa
+    da normalização, espaços repetidos ou quebras de linha entre as palavras
+    de um padrão não escapam do guard (diferente de detect_injection).
+
+    Args:
+        texto: Mensagem do usuário
+
+    Returns:
+        ResultadoGuard com o veredito, a mensagem de bloqueio e o texto redigido
+    """
+    texto = texto or ""
+    normalizado = normalizar(texto)
+    chave = hashlib.blake2b(normalizado.encode("utf-8"), digest_size=16).digest()
+
+    veredito = _cache.get(chave)
+    if veredito is None:
+        veredito = _verificar(normalizado)
+        _cache.put(chave, veredito)
+
+    is_injection, is_valid, mensagem = veredito
+    redigido, pii = redigir_pii(texto)
+    return ResultadoGuard(texto, redigido, is_injection, is_valid, mensagem, pii)
+
+
+def preprocessar_lote(textos: Iterable[str]) -> List[ResultadoGuard]:
+    """
+    Pré-processa várias mensagens, reaproveitando o resultado de textos repetidos.
+
+    Indicado para varrer o histórico de conversas: mensagens idênticas
+    (comuns em perguntas frequentes) são processadas uma única vez.
+
+    Args:
+        textos: Mensagens
+
+    Returns:
+        Resultados na mesma ordem das mensagens
+    """
+    vistos = {}
+    resultados = []
+    for texto in textos:
+        resultado = vistos.get(texto)
+        if resultado is None:
+            resultado = vistos[texto] = preprocessar(texto)
+        resultados.append(resultado)
+    return resultados
+
+
+def limpar_cache():
+    """
+    Recompila os padrões e esvazia o cache de vereditos.
+
+    Chame após alterar INJECTION_PATTERNS, ALLOWED_TOPICS ou PII_PATTERNS
+    em tempo de execução, para que preprocessar continue de acordo com
+    detect_injection e validate_topic.
+    """
+    _compilar_padroes()
+    _cache.clear()
@@ -0,0 +1 @@
+"""Módulo de testes de carga."""
@@ -0,0 +1,126 @@
+"""Executa o teste de carga pela linha de comando.
+
+Exemplo:
+    python -m src.chatbot_oficina.loadtest --niveis 1,2,4,8,16 --duracao 30
+"""
+import argparse
+import os
+import sys
+
+from langchain_core.runnables import RunnableLambda
+
+from src.chatbot_oficina.chat.model import get_llm
+from src.chatbot_oficina.database import client as database_client
+from src.chatbot_oficina.loadtest.fakes import CHAVE_FALSA, FakeOllamaServer, FakeSupabaseServer
+from src.chatbot_oficina.loadtest.report import formatar_tabela, salvar_json
+from src.chatbot_oficina.loadtest.simulator import encontrar_saturacao, varrer_concorrencia
+from src.chatbot_oficina.rag.chain import create_rag_chain
+from src.chatbot_oficina.rag.loader import load_documents, split_documents
+
+
+DATA_PATH = "data/documentos"
+
+
+def _criar_retriever(tipo: str, k: int):
+    """Cria o retriever: estático (sem embeddings) ou FAISS real."""
+    chunks = split_documents(load_documents(DATA_PATH))
+
+    if tipo == "faiss":
+        from src.chatbot_oficina.rag.vectorstore import create_embeddings, create_vectorstore
+        vectorstore = create_vectorstore(chunks, create_embeddings(), "data/loadtest_faiss_db")
+        return vectorstore.as_retriever(search_kwargs={"k": k})
+
+    return RunnableLambda(lambda _: chunks[:k])
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do chatbot")
+    parser.add_argument("--niveis", default="1,2,4,8,16,32",
+                        help="Níveis de concorrência separados por vírgula")
+    parser.add_argument("--duracao", type=float, default=30.0,
+                        help="Duração de cada nível, em segundos")
+    parser.add_argument("--mensagens", type=int, default=5, help="Mensagens por sessão")
+    parser.add_argument("--pensamento", type=float, default=1.0,
+                        help="Tempo médio entre mensagens, em segundos")
+    parser.add_argument("--clientes", type=int, default=100,
+                        help="Clientes cadastrados no Supabase falso")
+    parser.add_argument("--anonimos", type=float, default=0.2,
+                        help="Fração de logins com telefone não cadastrado")
+    parser.add_argument("--latencia-llm", type=float, default=0.8)
+    parser.add_argument("--erro-llm", type=float, default=0.0)
+    parser.add_argument("--latencia-db", type=float, default=0.05)
+    parser.add_argument("--erro-db", type=float, default=0.0)
+    parser.add_argument("--ollama-url", help="Usa este servidor em vez do Ollama falso")
+    parser.add_argument("--supabase-url", help="Usa este servidor em vez do Supabase falso")
+    parser.add_argument("--retriever", choices=["estatico", "faiss"], default="estatico")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--p95-maximo", type=float, help="SLO de latência p95, em segundos")
+    parser.add_argument("--erro-maximo", type=float, default=0.01)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", help="Salva os resultados neste arquivo")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    niveis = [int(n) for n in args.niveis.split(",")]
+
+    telefones = [f"1199{i:07d}" for i in range(args.clientes)]
+    anonimos = int(len(telefones) * args.anonimos / (1 - args.anonimos)) if args.anonimos < 1 else 0
+    telefones_login = telefones + [f"1198{i:07d}" for i in range(anonimos)]
+
+    servidores = []
+    if not args.ollama_url:
+        ollama = FakeOllamaServer(latencia=args.latencia_llm, taxa_erro=args.erro_llm, seed=args.seed)
+        servidores.append(ollama.start())
+        args.ollama_url = ollama.url
+    if not args.supabase_url:
+        supabase = FakeSupabaseServer(
+            clientes=[{"nome": f"Cliente {t}", "telefone": t} for t in telefones],
+            latencia=args.latencia_db,
+            taxa_erro=args.erro_db,
+            seed=args.seed,
+        )
+        servidores.append(supabase.start())
+        args.supabase_url = supabase.url
+        os.environ["SUPABASE_KEY"] = CHAVE_FALSA
+
+    os.environ["SUPABASE_URL"] = args.supabase_url
+    database_client._supabase_client = None
+
+    try:
+        llm = get_llm(os.getenv("OLLAMA_MODEL", "gemma3:4b"), base_url=args.ollama_url)
+        rag_chain = create_rag_chain(llm, _criar_retriever(args.retriever, args.k))
+
+        def progresso(resultado):
+            print(
+                f"[{resultado.concorrencia} usuários] {resultado.throughput:.2f} msg/s, "
+                f"p95 {resultado.p95:.3f}s, erros {100 * resultado.taxa_erro:.2f}%",
+                file=sys.stderr,
+            )
+
+        resultados = varrer_concorrencia(
+            niveis,
+            rag_chain,
+            telefones_login,
+            callback=progresso,
+            duracao=args.duracao,
+            mensagens=args.mensagens,
+            pensamento=args.pensamento,
+            seed=args.seed,
+        )
+    finally:
+        for servidor in servidores:
+            servidor.stop()
+
+    saturacao, saturou = encontrar_saturacao(
+        resultados, p95_maximo=args.p95_maximo, erro_maximo=args.erro_maximo
+    )
+    print(formatar_tabela(resultados, saturacao, saturou))
+
+    if args.json:
+        salvar_json(resultados, args.json, saturacao, saturou, parametros=vars(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Servidores falsos de Ollama e Supabase para testes de carga.
+
+Os servidores rodam em threads locais e imitam apenas as rotas usadas pelo
+chatbot (``/api/chat`` do Ollama e ``/rest/v1/<tabela>`` do PostgREST),
+com latência e taxa de erro configuráveis.
+"""
+import json
+import operator
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+
+RESPOSTA_PADRAO = (
+    "Olá! A troca de óleo leva cerca de 30 minutos e custa entre R$ 150 e R$ 350, "
+    "dependendo do veículo e do tipo de óleo. Deseja agendar um horário?"
+)
+
+# Chave no formato JWT aceito pelo cliente Supabase
+CHAVE_FALSA = "fake.eyJyb2xlIjoiYW5vbiJ9.fake"
+
+
+def _agora() -> str:
+    """Timestamp no formato de uma coluna TIMESTAMP (sem fuso) do Postgres."""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class _HandlerBase(BaseHTTPRequestHandler):
+    """Handler com latência e injeção de erro compartilhadas."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _ler_json(self) -> Any:
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        if not tamanho:
+            return None
+        return json.loads(self.rfile.read(tamanho))
+
+    def _enviar(self, status: int, corpo: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _simular_rede(self) -> bool:
+        """Aplica a latência configurada; retorna True se deve injetar erro."""
+        fake = self.server.fake
+        time.sleep(fake.sortear_latencia())
+        if fake.sortear_erro():
+            self._enviar(503, b'{"error": "erro injetado"}')
+            return True
+        return False
+
+
+class FakeServer:
+    """
+    Servidor HTTP local com latência e erros configuráveis.
+
+    Args:
+        latencia: Latência média por requisição, em segundos
+        jitter: Variação relativa da latência (0.2 = ±20%)
+        taxa_erro: Probabilidade de responder 503 em cada requisição
+        seed: Semente para reprodutibilidade
+    """
+
+    handler_class = _HandlerBase
+
+    def __init__(
+        self,
+        latencia: float = 0.0,
+        jitter: float = 0.2,
+        taxa_erro: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.latencia = latencia
+        self.jitter = jitter
+        self.taxa_erro = taxa_erro
+        self.requisicoes = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    def sortear_latencia(self) -> float:
+        with self._lock:
+            self.requisicoes += 1
+            fator = 1 + self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, self.latencia * fator)
+
+    def sortear_erro(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.taxa_erro
+
+    @property
+    def url(self) -> str:
+        host, porta = self._httpd.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def start(self) -> "FakeServer":
+        """Inicia o servidor em uma porta livre."""
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.handler_class)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Encerra o servidor."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _OllamaHandler(_HandlerBase):
+
+    def do_POST(self):
+        if self._simular_rede():
+            return
+
+        corpo = self._ler_json() or {}
+        if urlsplit(self.path).path != "/api/chat":
+            self._enviar(404, b'{"error": "not found"}')
+            return
+
+        fake = self.server.fake
+        modelo = corpo.get("model", "fake")
+        agora = datetime.now(timezone.utc).isoformat()
+        final = {
+            "model": modelo,
+            "created_at": agora,
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": 0,
+            "eval_count": 0,
+        }
+
+        if not corpo.get("stream", True):
+            final["message"]["content"] = fake.resposta
+            self._enviar(200, json.dumps(final).encode())
+            return
+
+        linhas = []
+        for token in fake.resposta.split(" "):
+            linhas.append(json.dumps({
+                "model": modelo,
+                "created_at": agora,
+                "message": {"role": "assistant", "content": token + " "},
+                "done": False,
+            }))
+        linhas.append(json.dumps(final))
+        self._enviar(200, ("\n".join(linhas) + "\n").encode(), "application/x-ndjson")
+
+
+class FakeOllamaServer(FakeServer):
+    """
+    Imita a rota ``/api/chat`` do Ollama.
+
+    Args:
+        resposta: Texto devolvido pelo modelo falso
+        **kwargs: Ver FakeServer
+    """
+
+    handler_class = _OllamaHandler
+
+    def __init__(self, resposta: str = RESPOSTA_PADRAO, **kwargs):
+        super().__init__(**kwargs)
+        self.resposta = resposta
+
+
+class _SupabaseHandler(_HandlerBase):
+
+    def _tabela(self) -> Optional[str]:
+        partes = urlsplit(self.path).path.strip("/").split("/")
+        if len(partes) == 3 and partes[:2] == ["rest", "v1"]:
+            return partes[2]
+        return None
+
+    def do_GET(self):
+        if self._simular_rede():
+            return
+
+        tabela = self._tabela()
+        if tabela is None:
+            self._enviar(404, b'{"message": "not found"}')
+            return
+
+        parametros = parse_qsl(urlsplit(self.path).query)
+        filtros = {}
+        opcoes = {}
+        for coluna, valor in parametros:
+            if coluna in ("select", "order", "limit"):
+                opcoes[coluna] = valor
+            elif "." in valor:
+                filtros[coluna] = tuple(valor.split(".", 1))
+
+        linhas = self.server.fake.selecionar(tabela, filtros, **opcoes)
+        self._enviar(200, json.dumps(linhas, default=str).encode())
+
+    def do_POST(self):
+        if self._simular_rede():
+            return
+
+        tabela = self._tabela()
+        corpo = self._ler_json()
+        if tabela is None or corpo is None:
+            self._enviar(400, b'{"message": "bad request"}')
+            return
+
+        registros = corpo if isinstance(corpo, list) else [corpo]
+        inseridos = [self.server.fake.inserir(tabela, r) for r in registros]
+        self._enviar(201, json.dumps(inseridos, default=str).encode())
+
+
+class FakeSupabaseServer(FakeServer):
+    """
+    Imita o subconjunto do PostgREST usado pelo repository.
+
+    Suporta ``select`` com filtros ``eq``/``gt``/``lt``, ``order`` e ``limit``, e
+    ``insert`` em qualquer tabela, mantendo os dados em memória.
+
+    Args:
+        clientes: Clientes pré-cadastrados
+        **kwargs: Ver FakeServer
+    """
+
+    handler_class = _SupabaseHandler
+
+    def __init__(self, clientes: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.tabelas: Dict[str, List[Dict[str, Any]]] = {"clientes": [], "conversas": []}
+        self._ids: Dict[str, int] = {}
+        for cliente in clientes or []:
+            self.inserir("clientes", cliente)
+
+    def inserir(self, tabela: str, registro: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            novo_id = self._ids.get(tabela, 0) + 1
+            self._ids[tabela] = novo_id
+            linha = {"id": novo_id, "created_at": _agora(), **registro}
+            self.tabelas.setdefault(tabela, []).append(linha)
+        return linha
+
+    def selecionar(
+        self,
+        tabela: str,
+        filtros: Dict[str, Tuple[str, str]],
+        select: str = "*",
+        order: Optional[str] = None,
+        limit: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Aplica filtros (eq, gt, lt), ordenação, limite e seleção de colunas."""
+        with self._lock:
+            linhas = list(self.tabelas.get(tabela, []))
+
+        for coluna, (operador, valor) in filtros.items():
+            comparar = _OPERADORES.get(operador)
+            if comparar is None:
+                continue
+            linhas = [linha for linha in linhas if comparar(linha.get(coluna), valor)]
+
+        if order:
+            coluna, _, direcao = order.partition(".")
+            linhas.sort(key=lambda linha: linha.get(coluna), reverse=direcao.startswith("desc"))
+
+        if limit:
+            linhas = linhas[:int(limit)]
+
+        if select != "*":
+            colunas = select.split(",")
+            linhas = [{c: linha.get(c) for c in colunas} for linha in linhas]
+
+        return linhas
+
+
+def _comparador(operador):
+    """Cria a comparação numérica (ou textual) de um operador do PostgREST."""
+    def comparar(atual: Any, valor: str) -> bool:
+        if atual is None:
+            return False
+        if isinstance(atual, (int, float)):
+            return operador(atual, float(valor))
+        return operador(str(atual), valor)
+    return comparar
+
+
+_OPERADORES = {
+    "eq": lambda atual, valor: str(atual) == valor,
+    "gt": _comparador(operator.gt),
+    "lt": _comparador(operator.lt),
+}
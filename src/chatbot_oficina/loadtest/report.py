@@ -0,0 +1,106 @@
+"""Relatório dos testes de carga."""
+import json
+from dataclasses import fields
+from pathlib import Path
+from typing import List, Optional
+
+from src.chatbot_oficina.loadtest.simulator import ResultadoNivel
+
+
+# (título, largura, formato, campo)
+COLUNAS = [
+    ("Usuários", 8, "", "concorrencia"),
+    ("Sessões", 8, "", "sessoes"),
+    ("Msgs", 6, "", "mensagens"),
+    ("Msg/s", 8, ".2f", "throughput"),
+    ("p50 (s)", 8, ".3f", "p50"),
+    ("p95 (s)", 8, ".3f", "p95"),
+    ("p99 (s)", 8, ".3f", "p99"),
+    ("Erro %", 7, ".2f", "taxa_erro_percent"),
+    ("Falha BD", 8, "", "falhas_persistencia"),
+    ("CPU %", 7, ".1f", "cpu_percent"),
+    ("Pico MB", 8, ".0f", "rss_mb"),
+]
+
+
+def _valores(resultado: ResultadoNivel) -> dict:
+    valores = {
+        campo.name: getattr(resultado, campo.name)
+        for campo in fields(resultado)
+        if campo.name != "amostras"
+    }
+    valores["taxa_erro"] = resultado.taxa_erro
+    valores["taxa_erro_percent"] = 100 * resultado.taxa_erro
+    return valores
+
+
+def formatar_tabela(
+    resultados: List[ResultadoNivel],
+    saturacao: Optional[ResultadoNivel] = None,
+    saturou: bool = True
+) -> str:
+    """
+    Formata os resultados da varredura como tabela de texto.
+
+    Args:
+        resultados: Resultados de cada nível
+        saturacao: Nível retornado por encontrar_saturacao
+        saturou: Se algum nível saturou (ver encontrar_saturacao)
+
+    Returns:
+        Tabela pronta para exibição
+    """
+    cabecalho = " ".join(f"{titulo:>{largura}}" for titulo, largura, _, _ in COLUNAS)
+    linhas = [cabecalho, "-" * len(cabecalho)]
+
+    for resultado in resultados:
+        valores = _valores(resultado)
+        linha = " ".join(
+            f"{valores[campo]:>{largura}{formato}}" if valores[campo] is not None else f"{'-':>{largura}}"
+            for _, largura, formato, campo in COLUNAS
+        )
+        if saturou and saturacao is not None and resultado.concorrencia == saturacao.concorrencia:
+            linha += "  <- saturação"
+        linhas.append(linha)
+
+    linhas.append("\nCPU % inclui os servidores falsos em execução no mesmo processo.")
+
+    if not saturou:
+        ultimo = resultados[-1].concorrencia if resultados else 0
+        linhas.append(f"Sem saturação até {ultimo} usuários simultâneos; teste níveis maiores")
+    elif saturacao is None:
+        linhas.append("Saturação: já no primeiro nível testado")
+    else:
+        linhas.append(
+            f"Saturação: ~{saturacao.concorrencia} usuários simultâneos "
+            f"({saturacao.throughput:.2f} msg/s, p95 {saturacao.p95:.3f}s)"
+        )
+
+    return "\n".join(linhas)
+
+
+def salvar_json(
+    resultados: List[ResultadoNivel],
+    caminho: str,
+    saturacao: Optional[ResultadoNivel] = None,
+    saturou: bool = True,
+    parametros: Optional[dict] = None
+):
+    """
+    Salva os resultados em JSON para comparação entre execuções.
+
+    Args:
+        resultados: Resultados de cada nível
+        caminho: Arquivo de saída
+        saturacao: Nível retornado por encontrar_saturacao
+        saturou: Se algum nível saturou
+        parametros: Parâmetros da execução
+    """
+    dados = {
+        "parametros": parametros or {},
+        "saturou": saturou,
+        "saturacao": saturacao.concorrencia if saturou and saturacao else None,
+        "niveis": [_valores(r) for r in resultados],
+    }
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+    Path(caminho).write_text(json.dumps(dados, indent=2, ensure_ascii=False), encoding="utf-8")
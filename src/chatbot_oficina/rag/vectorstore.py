@@ -1,6 +1,7 @@
 """Módulo para criação do vectorstore com FAISS."""
 import os
 from pathlib import Path
+from typing import Optional
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
 
@@ -13,14 +14,49 @@ def create_embeddings(model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
     )
 
 
-def create_vectorstore(chunks, embeddings, persist_directory: str = "data/faiss_db"):
-    """Cria e persiste o vectorstore."""
+def create_vectorstore(
+    chunks,
+    embeddings,
+    persist_directory: str = "data/faiss_db",
+    index_factory: Optional[str] = None,
+    search_params: Optional[str] = None
+):
+    """
+    Cria e persiste o vectorstore.
+    
+    Args:
+        chunks: Documentos a indexar
+        embeddings: Modelo de embeddings
+        persist_directory: Diretório onde o índice é salvo
+        index_factory: Descrição de índice FAISS (ex.: "HNSW32", "IVF16,Flat");
+            None usa o índice exato (Flat) padrão
+        search_params: Parâmetros de busca no formato do faiss.ParameterSpace
+            (ex.: "nprobe=4" para IVF, "efSearch=64" para HNSW)
+    """
     Path(persist_directory).mkdir(parents=True, exist_ok=True)
     
     vectorstore = FAISS.from_documents(
         documents=chunks,
         embedding=embeddings
     )
+    
+    if index_factory and index_factory != "Flat":
+        import faiss
+        
+        # Reaproveita os vetores já calculados no índice Flat
+        flat = vectorstore.index
+        vectors = flat.reconstruct_n(0, flat.ntotal)
+        index = faiss.index_factory(flat.d, index_factory, flat.metric_type)
+        if not index.is_trained:
+            index.train(vectors)
+        index.add(vectors)
+        vectorstore.index = index
+    
+    if search_params:
+        import faiss
+        
+        faiss.ParameterSpace().set_index_parameters(vectorstore.index, search_params)
+    
     vectorstore.save_local(persist_directory)
     return vectorstore
 
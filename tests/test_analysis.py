@@ -0,0 +1,72 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("numpy")
+
+from src.chatbot_oficina.analytics.analysis import agrupar_perguntas, perguntas_frequentes
+
+
+TOPICOS = {
+    "óleo": ["troca de óleo sintético", "óleo sintético motor", "preço troca óleo"],
+    "pix": ["pagamento via pix", "chave pix pagamento", "aceitam pix"],
+    "freio": ["pastilha freio gasta", "freio rangendo pastilha", "disco freio pastilha"],
+    "bateria": ["bateria descarregada", "bateria arriando manhã", "carga bateria fraca"],
+}
+SAUDACOES = ["oi", "ok", "obrigado", "bom dia", "olá"]
+
+
+def _tabela(mensagens):
+    return pa.table({
+        "mensagem": mensagens,
+        "fora_tema": [False] * len(mensagens),
+        "sem_resposta": [False] * len(mensagens),
+    })
+
+
+def _grupo_de(grupos, termo):
+    return [g for g in grupos if g["grupo"] >= 0 and termo in g["termos"]]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_topicos_separados_viram_grupos_separados(seed):
+    mensagens = [m for exemplos in TOPICOS.values() for m in exemplos * 10] + SAUDACOES * 40
+    grupos = agrupar_perguntas(_tabela(mensagens), n_grupos=4, seed=seed)
+
+    agrupados = [g for g in grupos if g["grupo"] >= 0]
+    assert len(agrupados) == 4
+    for termo in TOPICOS:
+        encontrados = _grupo_de(grupos, termo)
+        assert len(encontrados) == 1
+        assert encontrados[0]["tamanho"] == 30
+
+    # Saudações só com stopwords ficam fora dos grupos
+    sem_grupo = grupos[-1]
+    assert sem_grupo["grupo"] == -1
+    assert sem_grupo["tamanho"] == 200
+    assert sem_grupo["exemplo"] in SAUDACOES
+
+
+def test_perguntas_sem_termo_em_comum_nao_caem_no_grupo_zero():
+    mensagens = ["troca de óleo", "pagamento pix", "pastilha freio", "bateria descarregada", "pneu furado"]
+    grupos = agrupar_perguntas(_tabela(mensagens), n_grupos=3)
+
+    agrupados = [g for g in grupos if g["grupo"] >= 0]
+    assert len(agrupados) == 3
+    assert all(g["perguntas_distintas"] == 1 for g in agrupados)
+    assert grupos[-1]["grupo"] == -1
+    assert grupos[-1]["perguntas_distintas"] == 2
+
+
+def test_apenas_saudacoes():
+    grupos = agrupar_perguntas(_tabela(SAUDACOES * 3), n_grupos=3)
+    assert [g["grupo"] for g in grupos] == [-1]
+    assert grupos[0]["tamanho"] == 15
+
+
+def test_perguntas_frequentes_ignora_nulas_e_vazias():
+    mensagens = [None] * 5 + ["", "  ", "?!"] * 4 + ["Troca de óleo?"] * 3 + ["pix"] * 2 + ["freio"]
+    assert perguntas_frequentes(pa.table({"mensagem": mensagens}), n=3) == [
+        {"pergunta": "troca de óleo", "contagem": 3},
+        {"pergunta": "pix", "contagem": 2},
+        {"pergunta": "freio", "contagem": 1},
+    ]
@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.chatbot_oficina.evaluation.harness import Configuracao, montar_grade
+
+
+def test_montar_grade_separa_parametros_de_busca():
+    grade = montar_grade(["m"], [500], [100], ["Flat", "HNSW32|efSearch=64", "IVF16,Flat | nprobe=4"])
+    assert grade == [
+        Configuracao("m", 500, 100, "Flat", ""),
+        Configuracao("m", 500, 100, "HNSW32", "efSearch=64"),
+        Configuracao("m", 500, 100, "IVF16,Flat", "nprobe=4"),
+    ]
+
+
+def test_montar_grade_ignora_overlap_invalido_e_repeticoes():
+    grade = montar_grade(["m"], [100, 300], [100, 50], ["Flat", "Flat"])
+    assert [(c.chunk_size, c.chunk_overlap) for c in grade] == [(100, 50), (300, 100), (300, 50)]
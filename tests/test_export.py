@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.chatbot_oficina.analytics.export import CHECKPOINT_FILE, carregar_conversas, exportar_conversas
+
+
+CONVERSAS = [
+    {
+        "id": i,
+        "cliente_id": i % 3 + 1,
+        "mensagem": f"pergunta {i}",
+        "resposta": f"resposta {i}",
+        "created_at": f"2026-01-01T10:00:{i % 60:02d}",
+    }
+    for i in range(1, 26)
+]
+
+
+def _buscar(apos_id, limite):
+    return [c for c in CONVERSAS if c["id"] > apos_id][:limite]
+
+
+def test_exporta_por_keyset(tmp_path):
+    consultas = []
+
+    def buscar(apos_id, limite):
+        consultas.append(apos_id)
+        return _buscar(apos_id, limite)
+
+    checkpoint = exportar_conversas(str(tmp_path), tamanho_pagina=4, linhas_por_arquivo=10, buscar_pagina=buscar)
+
+    assert checkpoint == {"ultimo_id": 25, "partes": 3, "linhas": 25}
+    assert consultas == [0, 4, 8, 12, 16, 20, 24]
+    assert sorted(p.name for p in tmp_path.glob("conversas-*")) == [
+        "conversas-00000.parquet", "conversas-00001.parquet", "conversas-00002.parquet"
+    ]
+
+    tabela = carregar_conversas(str(tmp_path))
+    assert tabela.column("id").to_pylist() == list(range(1, 26))
+    assert tabela.column("mensagem")[0].as_py() == "pergunta 1"
+
+
+def test_retoma_apos_interrupcao(tmp_path):
+    def buscar_com_falha(apos_id, limite):
+        if apos_id >= 12:
+            raise ConnectionError("conexão perdida")
+        return _buscar(apos_id, limite)
+
+    with pytest.raises(ConnectionError):
+        exportar_conversas(str(tmp_path), tamanho_pagina=4, linhas_por_arquivo=10, buscar_pagina=buscar_com_falha)
+
+    # Só o arquivo completo fica; a parte incompleta é descartada
+    assert [p.name for p in tmp_path.glob("conversas-*")] == ["conversas-00000.parquet"]
+    assert json.loads((tmp_path / CHECKPOINT_FILE).read_text()) == {"ultimo_id": 12, "partes": 1, "linhas": 12}
+
+    consultas = []
+
+    def buscar(apos_id, limite):
+        consultas.append(apos_id)
+        return _buscar(apos_id, limite)
+
+    checkpoint = exportar_conversas(str(tmp_path), tamanho_pagina=4, linhas_por_arquivo=10, buscar_pagina=buscar)
+
+    assert consultas[0] == 12
+    assert checkpoint["linhas"] == 25
+    assert carregar_conversas(str(tmp_path), ["id"]).column("id").to_pylist() == list(range(1, 26))
+
+
+def test_sem_novas_conversas(tmp_path):
+    exportar_conversas(str(tmp_path), buscar_pagina=_buscar)
+    checkpoint = exportar_conversas(str(tmp_path), buscar_pagina=_buscar)
+    assert checkpoint == {"ultimo_id": 25, "partes": 1, "linhas": 25}
+    assert carregar_conversas(str(tmp_path)).num_rows == 25
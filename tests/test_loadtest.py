@@ -0,0 +1,57 @@
+import pytest
+
+from src.chatbot_oficina.loadtest.report import formatar_tabela
+from src.chatbot_oficina.loadtest.simulator import ResultadoNivel, encontrar_saturacao, percentil
+
+
+def _nivel(concorrencia, throughput, p95=1.0, erros=0, mensagens=100):
+    return ResultadoNivel(
+        concorrencia=concorrencia, duracao=10.0, sessoes=20, mensagens=mensagens, erros=erros,
+        falhas_persistencia=0, throughput=throughput, p50=p95 / 2, p95=p95, p99=p95, max=p95,
+        login_p95=0.1, cpu_percent=10.0, rss_mb=None,
+    )
+
+
+def test_percentil_interpola():
+    valores = [4.0, 1.0, 3.0, 2.0]
+    assert percentil(valores, 0) == 1.0
+    assert percentil(valores, 50) == pytest.approx(2.5)
+    assert percentil(valores, 100) == 4.0
+    assert percentil([7.0], 95) == 7.0
+
+
+def test_percentil_vazio():
+    assert percentil([], 95) == 0.0
+
+
+def test_saturacao_por_throughput():
+    resultados = [_nivel(1, 1.0), _nivel(2, 1.9), _nivel(4, 2.0)]
+    nivel, saturou = encontrar_saturacao(resultados)
+    assert saturou
+    assert nivel.concorrencia == 2
+
+
+def test_saturacao_por_p95_e_erros():
+    resultados = [_nivel(1, 1.0), _nivel(2, 2.0, p95=5.0)]
+    assert encontrar_saturacao(resultados, p95_maximo=3.0)[0].concorrencia == 1
+
+    resultados = [_nivel(1, 1.0), _nivel(2, 2.0, erros=10)]
+    assert encontrar_saturacao(resultados)[0].concorrencia == 1
+
+
+def test_saturacao_no_primeiro_nivel():
+    nivel, saturou = encontrar_saturacao([_nivel(1, 1.0, erros=50)])
+    assert saturou
+    assert nivel is None
+    assert "já no primeiro nível" in formatar_tabela([_nivel(1, 1.0, erros=50)], nivel, saturou)
+
+
+def test_sem_saturacao():
+    resultados = [_nivel(1, 1.0), _nivel(2, 2.0), _nivel(4, 4.0)]
+    nivel, saturou = encontrar_saturacao(resultados)
+    assert not saturou
+    assert nivel.concorrencia == 4
+
+    tabela = formatar_tabela(resultados, nivel, saturou)
+    assert "<- saturação" not in tabela
+    assert "Sem saturação até 4 usuários" in tabela
@@ -0,0 +1,43 @@
+from langchain_core.runnables import RunnableLambda
+
+from src.chatbot_oficina.chat import pipeline
+from src.chatbot_oficina.chat.pipeline import processar_mensagem
+
+
+RAG = RunnableLambda(lambda texto: f"resposta para: {texto}")
+
+
+def test_guard_nao_chama_rag():
+    def falhar(_):
+        raise AssertionError("RAG não deveria ser chamado")
+
+    resposta = processar_mensagem("Qual a capital da França?", RunnableLambda(falhar))
+    assert resposta.origem == "topic"
+    assert resposta.conversa_id is None
+
+
+def test_rag_recebe_texto_redigido(monkeypatch):
+    salvas = []
+    monkeypatch.setattr(pipeline, "salvar_conversa", lambda *args: salvas.append(args) or 42)
+
+    resposta = processar_mensagem("Meu email é ana@exemplo.com, quanto custa a troca de óleo?", RAG, 7)
+    assert resposta.origem == "rag"
+    assert "ana@exemplo.com" not in resposta.resposta
+    assert resposta.conversa_id == 42
+    assert salvas == [(7, resposta.redigido, resposta.resposta)]
+
+
+def test_falha_ao_salvar_nao_descarta_resposta(monkeypatch):
+    def salvar(*_):
+        raise RuntimeError("banco indisponível")
+
+    monkeypatch.setattr(pipeline, "salvar_conversa", salvar)
+    resposta = processar_mensagem("Quanto custa a troca de óleo?", RAG, 7)
+    assert resposta.resposta.startswith("resposta para:")
+    assert resposta.conversa_id is None
+    assert resposta.erro_persistencia == "banco indisponível"
+
+
+def test_anonimo_nao_salva(monkeypatch):
+    monkeypatch.setattr(pipeline, "salvar_conversa", lambda *_: 1 / 0)
+    assert processar_mensagem("Quanto custa a troca de óleo?", RAG, 0).erro_persistencia is None